@@ -0,0 +1,260 @@
+"""
+In-process runtime for the assistant0 graph.
+
+Used when AGENT_MODE is "embedded": instead of proxying chat requests to a
+separate LangGraph server, the FastAPI app runs the graph directly and emits the
+same Server-Sent Events as the LangGraph API. Only the subset of the API used by
+`useStream` from @langchain/langgraph-sdk is implemented (threads, thread
+state/history and streamed runs), so the frontend works unchanged.
+
+Threads and checkpoints are stored in memory, like `langgraph dev`.
+Note: This won't work if you scale to multiple instances without sticky sessions.
+"""
+
+import asyncio
+import dataclasses
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.pregel import Pregel
+from langgraph.types import Command, StateSnapshot
+
+from app.agents.assistant0 import agent
+
+# Stream modes understood by the frontend, mapped to LangGraph stream modes
+STREAM_MODES = {
+    "values": "values",
+    "updates": "updates",
+    "messages-tuple": "messages",
+    "custom": "custom",
+}
+
+
+class ThreadBusyError(Exception):
+    """Raised when a run is started on a thread that already has one in flight."""
+
+
+def _serialize(obj: Any) -> Any:
+    """JSON fallback for LangChain messages, interrupts and other graph values."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "to_json") and callable(obj.to_json):
+        return obj.to_json()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def _sse(event: str, data: Any) -> bytes:
+    """Encode a single Server-Sent Event in the LangGraph API wire format."""
+    return f"event: {event}\ndata: {json.dumps(data, default=_serialize)}\n\n".encode("utf-8")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _checkpoint(config: Optional[dict]) -> Optional[dict[str, Any]]:
+    if not config:
+        return None
+    configurable = config.get("configurable", {})
+    return {
+        "thread_id": configurable.get("thread_id"),
+        "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+        "checkpoint_id": configurable.get("checkpoint_id"),
+    }
+
+
+def _thread_state(snapshot: StateSnapshot) -> dict[str, Any]:
+    """Convert a StateSnapshot into the ThreadState shape returned by the LangGraph API."""
+    checkpoint = _checkpoint(snapshot.config)
+    parent_checkpoint = _checkpoint(snapshot.parent_config)
+    return {
+        "values": snapshot.values,
+        "next": list(snapshot.next),
+        "tasks": [
+            {
+                "id": task.id,
+                "name": task.name,
+                "error": str(task.error) if task.error else None,
+                "interrupts": list(task.interrupts),
+                "checkpoint": None,
+                "state": None,
+                "result": task.result,
+            }
+            for task in snapshot.tasks
+        ],
+        "checkpoint": checkpoint,
+        "parent_checkpoint": parent_checkpoint,
+        "checkpoint_id": checkpoint["checkpoint_id"] if checkpoint else None,
+        "parent_checkpoint_id": parent_checkpoint["checkpoint_id"] if parent_checkpoint else None,
+        "metadata": snapshot.metadata,
+        "created_at": snapshot.created_at,
+    }
+
+
+class EmbeddedAgentRuntime:
+    """
+    Runs a compiled graph in-process with an in-memory checkpointer.
+
+    Each thread records the user that created it, and is only visible to that user.
+    """
+
+    def __init__(self, graph: Pregel):
+        self.graph = graph.copy(update={"checkpointer": InMemorySaver()})
+        self._threads: dict[str, dict[str, Any]] = {}
+        self._owners: dict[str, str] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def create_thread(self, owner: str, metadata: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """Creates a new, empty thread owned by the given user."""
+        thread_id = str(uuid.uuid4())
+        now = _now()
+        thread = {
+            "thread_id": thread_id,
+            "created_at": now,
+            "updated_at": now,
+            "metadata": metadata or {},
+            "status": "idle",
+            "values": {},
+        }
+        self._threads[thread_id] = thread
+        self._owners[thread_id] = owner
+        self._locks[thread_id] = asyncio.Lock()
+        return thread
+
+    def get_thread(self, thread_id: str, owner: str) -> Optional[dict[str, Any]]:
+        """Returns the thread if it exists and belongs to the given user."""
+        if self._owners.get(thread_id) != owner:
+            return None
+        return self._threads.get(thread_id)
+
+    async def get_state(self, thread_id: str) -> dict[str, Any]:
+        snapshot = await self.graph.aget_state({"configurable": {"thread_id": thread_id}})
+        return _thread_state(snapshot)
+
+    async def get_history(
+        self,
+        thread_id: str,
+        limit: int = 10,
+        before: Optional[dict[str, Any] | str] = None,
+    ) -> list[dict[str, Any]]:
+        config = {"configurable": {"thread_id": thread_id}}
+        # `before` is either a checkpoint id or a checkpoint dict, as in the LangGraph API
+        if isinstance(before, str):
+            before = {"checkpoint_id": before}
+        before_config = None
+        if before and before.get("checkpoint_id"):
+            before_config = {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": before.get("checkpoint_ns", ""),
+                    "checkpoint_id": before["checkpoint_id"],
+                }
+            }
+        return [
+            _thread_state(snapshot)
+            async for snapshot in self.graph.aget_state_history(config, limit=limit, before=before_config)
+        ]
+
+    def stream_run(
+        self,
+        thread_id: str,
+        input: Any,
+        user_id: str,
+        credentials: dict[str, Any],
+        command: Optional[dict[str, Any]] = None,
+        checkpoint: Optional[dict[str, Any]] = None,
+        stream_mode: Optional[list[str] | str] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Starts a run on the thread and returns its events as encoded SSE chunks.
+
+        A run on a thread that already has one in flight raises ThreadBusyError
+        (the LangGraph API "reject" multitask strategy). The thread is only marked
+        busy once the stream starts, so a response that is never iterated (e.g. the
+        client disconnected first) can't leave the thread stuck.
+        """
+        thread = self._threads[thread_id]
+        if self._locks[thread_id].locked():
+            raise ThreadBusyError(f"Thread {thread_id} is already running a task")
+
+        if isinstance(stream_mode, str):
+            stream_mode = [stream_mode]
+        requested_modes = [mode for mode in (stream_mode or ["values"]) if mode in STREAM_MODES]
+        emit_modes = [STREAM_MODES[mode] for mode in requested_modes] or ["values"]
+        # Interrupts only surface in `updates` chunks; stream them internally so they
+        # can be reported as `values` events, like the LangGraph server does
+        graph_modes = emit_modes if "updates" in emit_modes else [*emit_modes, "updates"]
+
+        # Like the proxy, the client's `config` is never forwarded: only the server
+        # decides the configurable values and limits a run executes with
+        run_id = str(uuid.uuid4())
+        run_config = {
+            "run_id": run_id,
+            "configurable": {
+                "thread_id": thread_id,
+                "user_id": user_id,
+                "_credentials": credentials,
+            },
+        }
+        if checkpoint and checkpoint.get("checkpoint_id"):
+            run_config["configurable"]["checkpoint_id"] = checkpoint["checkpoint_id"]
+        graph_input = Command(**command) if command else input
+
+        return self._stream(thread, run_id, graph_input, run_config, graph_modes, emit_modes)
+
+    async def _stream(
+        self,
+        thread: dict[str, Any],
+        run_id: str,
+        graph_input: Any,
+        config: dict[str, Any],
+        stream_mode: list[str],
+        emit_modes: list[str],
+    ) -> AsyncIterator[bytes]:
+        lock = self._locks[thread["thread_id"]]
+        # Another run may have started between stream_run and the first iteration
+        if lock.locked():
+            yield _sse("error", {
+                "error": ThreadBusyError.__name__,
+                "message": f"Thread {thread['thread_id']} is already running a task",
+            })
+            return
+
+        async with lock:
+            thread["status"] = "busy"
+            status = "idle"
+            try:
+                yield _sse("metadata", {"run_id": run_id, "attempt": 1})
+                async for mode, chunk in self.graph.astream(graph_input, config, stream_mode=stream_mode):
+                    if (
+                        mode == "updates"
+                        and "values" in emit_modes
+                        and isinstance(chunk, dict)
+                        and "__interrupt__" in chunk
+                    ):
+                        yield _sse("values", {"__interrupt__": chunk["__interrupt__"]})
+                    if mode in emit_modes:
+                        yield _sse(mode, chunk)
+
+                snapshot = await self.graph.aget_state({"configurable": {"thread_id": thread["thread_id"]}})
+                thread["values"] = snapshot.values
+                if snapshot.interrupts or snapshot.next:
+                    status = "interrupted"
+            except Exception as e:
+                status = "error"
+                yield _sse("error", {"error": type(e).__name__, "message": str(e)})
+            finally:
+                thread["status"] = status
+                thread["updated_at"] = _now()
+
+
+runtime = EmbeddedAgentRuntime(agent)
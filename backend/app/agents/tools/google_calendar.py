@@ -1,45 +1,20 @@
-from langchain_core.tools import StructuredTool
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from typing import Annotated
+
+from langchain_core.messages import ToolCall
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import InjectedToolCallId, StructuredTool
 from pydantic import BaseModel
 from auth0_ai_langchain.token_vault import (
     get_access_token_from_token_vault,
 )
-import datetime
+import asyncio
 import json
 
 from app.core.auth0_ai import with_calendar_access
+from app.core.calendar_prefetch import calendar_prefetcher, fetch_upcoming_events
 
 
-async def list_upcoming_events_fn():
-    """List upcoming events from the user's Google Calendar"""
-    google_access_token = get_access_token_from_token_vault()
-    if not google_access_token:
-        raise ValueError(
-            "Authorization required to access the Federated Connection API"
-        )
-
-    calendar_service = build(
-        "calendar",
-        "v3",
-        credentials=Credentials(google_access_token),
-    )
-
-    events = (
-        calendar_service.events()
-        .list(
-            calendarId="primary",
-            timeMin=datetime.datetime.now().isoformat() + "Z",
-            timeMax=(datetime.datetime.now() + datetime.timedelta(days=7)).isoformat()
-            + "Z",
-            maxResults=5,
-            singleEvents=True,
-            orderBy="startTime",
-        )
-        .execute()
-        .get("items", [])
-    )
-
+def _format_events(events: list[dict]) -> str:
     return json.dumps(
         [
             {
@@ -51,11 +26,73 @@ async def list_upcoming_events_fn():
     )
 
 
-list_upcoming_events = with_calendar_access(
+async def list_upcoming_events_from_token_vault_fn():
+    """List upcoming events from the user's Google Calendar"""
+    google_access_token = get_access_token_from_token_vault()
+    if not google_access_token:
+        raise ValueError(
+            "Authorization required to access the Federated Connection API"
+        )
+
+    # The Google API client is blocking; run it off the event loop so it doesn't
+    # stall other requests when the agent runs inside the FastAPI process
+    events = await asyncio.to_thread(fetch_upcoming_events, google_access_token)
+
+    return _format_events(events)
+
+
+list_upcoming_events_from_token_vault = with_calendar_access(
     StructuredTool(
         name="list_upcoming_events",
         description="List upcoming events from the user's Google Calendar",
         args_schema=BaseModel,
-        coroutine=list_upcoming_events_fn,
+        coroutine=list_upcoming_events_from_token_vault_fn,
     )
 )
+
+
+class ListUpcomingEventsInput(BaseModel):
+    tool_call_id: Annotated[str, InjectedToolCallId]
+
+
+async def list_upcoming_events_fn(config: RunnableConfig, tool_call_id: str):
+    """List upcoming events from the user's Google Calendar"""
+    # Serve prefetched events first, skipping the Token Vault exchange entirely
+    configurable = config.get("configurable", {})
+    user_id = configurable.get("user_id")
+    events = await calendar_prefetcher.get_events(user_id)
+    if events is not None:
+        return _format_events(events)
+
+    # The Token Vault exchange is a blocking HTTP call; run it off the event loop
+    # so it doesn't stall other requests when the agent runs inside the FastAPI process
+    refresh_token = configurable.get("_credentials", {}).get("refresh_token")
+    token_response = (
+        await asyncio.to_thread(calendar_prefetcher.exchange_token, refresh_token)
+        if refresh_token
+        else None
+    )
+    if token_response is not None:
+        calendar_prefetcher.store_access_token(user_id, token_response)
+        events = await asyncio.to_thread(fetch_upcoming_events, token_response["access_token"])
+        return _format_events(events)
+
+    # Not connected (or missing scopes): let the Token Vault tool raise the interrupt
+    tool_message = await list_upcoming_events_from_token_vault.ainvoke(
+        ToolCall(
+            name=list_upcoming_events_from_token_vault.name,
+            args={},
+            id=tool_call_id,
+            type="tool_call",
+        ),
+        config,
+    )
+    return tool_message.content
+
+
+list_upcoming_events = StructuredTool(
+    name="list_upcoming_events",
+    description="List upcoming events from the user's Google Calendar",
+    args_schema=ListUpcomingEventsInput,
+    coroutine=list_upcoming_events_fn,
+)
@@ -20,9 +20,16 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from typing import List, Optional
 import os
 
-from app.api.routes.chat import agent_router
 from app.api.routes.profile import user_router
 from app.core.auth import auth_router, auth_client, auth_config
+from app.core.config import settings
+
+# In embedded mode the agent runs in-process, so the LangGraph proxy (and its
+# HTTP hop to the LangGraph server) is replaced by an API-compatible router
+if settings.AGENT_MODE == "embedded":
+    from app.api.routes.embedded_chat import embedded_agent_router as agent_router
+else:
+    from app.api.routes.chat import agent_router
 
 api_router = APIRouter()
 
@@ -0,0 +1,80 @@
+from typing import Any, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.agents.embedded import ThreadBusyError, runtime
+from app.core.auth import auth_client
+from app.core.calendar_prefetch import calendar_prefetcher
+
+embedded_agent_router = APIRouter(prefix="/agent", tags=["agent"])
+
+
+def _owner(auth_session: dict) -> str:
+    return (auth_session.get("user") or {}).get("sub", "")
+
+
+def _require_thread(thread_id: str, auth_session: dict) -> dict[str, Any]:
+    thread = runtime.get_thread(thread_id, _owner(auth_session))
+    if thread is None:
+        raise HTTPException(status_code=404, detail=f"Thread {thread_id} not found")
+    return thread
+
+
+@embedded_agent_router.post("/threads")
+async def create_thread(
+    body: dict[str, Any] = Body(default_factory=dict),
+    auth_session=Depends(auth_client.require_session),
+):
+    calendar_prefetcher.schedule(auth_session)
+    return runtime.create_thread(_owner(auth_session), body.get("metadata"))
+
+
+@embedded_agent_router.get("/threads/{thread_id}")
+async def get_thread(thread_id: str, auth_session=Depends(auth_client.require_session)):
+    return _require_thread(thread_id, auth_session)
+
+
+@embedded_agent_router.get("/threads/{thread_id}/state")
+async def get_thread_state(thread_id: str, auth_session=Depends(auth_client.require_session)):
+    _require_thread(thread_id, auth_session)
+    return await runtime.get_state(thread_id)
+
+
+@embedded_agent_router.post("/threads/{thread_id}/history")
+async def get_thread_history(
+    thread_id: str,
+    body: dict[str, Any] = Body(default_factory=dict),
+    auth_session=Depends(auth_client.require_session),
+):
+    _require_thread(thread_id, auth_session)
+    before: Optional[dict[str, Any] | str] = body.get("before")
+    return await runtime.get_history(thread_id, limit=body.get("limit") or 10, before=before)
+
+
+@embedded_agent_router.post("/threads/{thread_id}/runs/stream")
+async def stream_run(
+    thread_id: str,
+    body: dict[str, Any] = Body(default_factory=dict),
+    auth_session=Depends(auth_client.require_session),
+):
+    _require_thread(thread_id, auth_session)
+    try:
+        events = runtime.stream_run(
+            thread_id,
+            input=body.get("input"),
+            user_id=_owner(auth_session),
+            # Credentials go straight into `configurable`, as the proxy does for the LangGraph server
+            credentials={"refresh_token": auth_session.get("refresh_token")},
+            command=body.get("command"),
+            checkpoint=body.get("checkpoint"),
+            stream_mode=body.get("stream_mode"),
+        )
+    except ThreadBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return StreamingResponse(
+        events,
+        status_code=200,
+        media_type="text/event-stream",
+    )
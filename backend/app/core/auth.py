@@ -1,7 +1,11 @@
+import base64
+import json
+
 from auth0_fastapi.auth import AuthClient
 from auth0_fastapi.config import Auth0Config
 from auth0_fastapi.server.routes import router as auth_router, register_auth_routes
 
+from app.core.calendar_prefetch import calendar_prefetcher
 from app.core.config import settings
 from app.core.transaction_store import InMemoryTransactionStore
 
@@ -27,6 +31,44 @@ transaction_store = InMemoryTransactionStore(
     expiration_seconds=300  # 5 minutes
 )
 
-auth_client = AuthClient(auth_config, transaction_store=transaction_store)
+
+class PrefetchingAuthClient(AuthClient):
+    """
+    AuthClient that schedules a calendar prefetch after a successful login or
+    account connect, and evicts the user's cached calendar data on logout.
+    Both the library auth routes and the Cloud Workstation overrides in
+    api_router.py go through these methods.
+    """
+
+    async def complete_login(self, callback_url: str, store_options: dict = None) -> dict:
+        session_data = await super().complete_login(callback_url, store_options=store_options)
+        calendar_prefetcher.schedule(session_data.get("state_data"))
+        return session_data
+
+    async def complete_connect_account(self, url: str, store_options: dict = None):
+        connect_complete_response = await super().complete_connect_account(url, store_options=store_options)
+        if calendar_prefetcher.enabled:
+            calendar_prefetcher.schedule(await self.client.get_session(store_options=store_options))
+        return connect_complete_response
+
+    async def logout(self, return_to: str = None, store_options: dict = None) -> str:
+        session = await self.client.get_session(store_options=store_options)
+        user_id = ((session or {}).get("user") or {}).get("sub")
+        logout_url = await super().logout(return_to=return_to, store_options=store_options)
+        if user_id:
+            calendar_prefetcher.evict(user_id)
+        return logout_url
+
+    async def handle_backchannel_logout(self, logout_token: str) -> None:
+        await super().handle_backchannel_logout(logout_token)
+        # The token was verified above, so its claims can be read without re-verifying
+        payload = logout_token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        user_id = claims.get("sub")
+        if user_id:
+            calendar_prefetcher.evict(user_id)
+
+
+auth_client = PrefetchingAuthClient(auth_config, transaction_store=transaction_store)
 
 register_auth_routes(auth_router, auth_config)
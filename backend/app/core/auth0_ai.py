@@ -13,8 +13,11 @@ auth0_ai = Auth0AI(
     )
 )
 
+CALENDAR_CONNECTION = "google-oauth2"
+CALENDAR_SCOPES = ["openid", "https://www.googleapis.com/auth/calendar.events"]
+
 with_calendar_access = auth0_ai.with_token_vault(
-    connection="google-oauth2",
-    scopes=["openid", "https://www.googleapis.com/auth/calendar.events"],
+    connection=CALENDAR_CONNECTION,
+    scopes=CALENDAR_SCOPES,
     # Optional: authorization_params={"login_hint": "user@example.com", "ui_locales": "en"}
 )
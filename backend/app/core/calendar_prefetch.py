@@ -0,0 +1,248 @@
+"""
+Speculative Google Calendar prefetch.
+
+The first calendar question after login is the slowest: it pays for the Token Vault
+exchange, the Google client setup and the Calendar fetch while the user waits. When
+enabled, a successful login, account connect or new chat thread schedules a background
+prefetch that warms the user's Google access token and upcoming events into a bounded,
+TTL'd in-memory cache. The `list_upcoming_events` tool reads this cache first.
+
+Prefetching only helps in embedded agent mode, where the tool runs in the same process
+as the FastAPI app. Prefetches run with bounded concurrency, are deduplicated per user
+and are dropped (never queued) when too many are pending, so they don't compete with
+live requests.
+"""
+
+import asyncio
+import datetime
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from auth0 import Auth0Error
+from auth0.authentication.get_token import GetToken
+from auth0_ai.authorizers.token_vault_authorizer import (
+    REQUESTED_TOKEN_TYPE_TOKEN_VAULT_ACCESS_TOKEN,
+    SUBJECT_TYPE_REFRESH_TOKEN,
+)
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from app.core.auth0_ai import CALENDAR_CONNECTION, CALENDAR_SCOPES
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stop using a cached access token this long before Google expires it
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
+
+def fetch_upcoming_events(google_access_token: str) -> list[dict]:
+    """Fetches the user's events for the next 7 days. Blocking, run it in a thread."""
+    calendar_service = build(
+        "calendar",
+        "v3",
+        credentials=Credentials(google_access_token),
+    )
+
+    return (
+        calendar_service.events()
+        .list(
+            calendarId="primary",
+            timeMin=datetime.datetime.now().isoformat() + "Z",
+            timeMax=(datetime.datetime.now() + datetime.timedelta(days=7)).isoformat()
+            + "Z",
+            maxResults=5,
+            singleEvents=True,
+            orderBy="startTime",
+        )
+        .execute()
+        .get("items", [])
+    )
+
+
+class CalendarCache:
+    """
+    Bounded, TTL'd cache of Google access tokens and upcoming events, keyed by user.
+
+    The least recently used user is evicted once max_entries is reached.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def _entry(self, user_id: str) -> dict[str, Any]:
+        entry = self._entries.setdefault(user_id, {})
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def get_access_token(self, user_id: str) -> Optional[str]:
+        entry = self._entries.get(user_id)
+        if not entry or time.time() > entry.get("token_expires_at", 0):
+            return None
+        return entry["access_token"]
+
+    def get_events(self, user_id: str) -> Optional[list[dict]]:
+        entry = self._entries.get(user_id)
+        if not entry or time.time() > entry.get("events_expires_at", 0):
+            return None
+        self._entries.move_to_end(user_id)
+        return entry["events"]
+
+    def set_access_token(self, user_id: str, access_token: str, expires_in: int) -> None:
+        entry = self._entry(user_id)
+        entry["access_token"] = access_token
+        entry["token_expires_at"] = time.time() + expires_in - TOKEN_EXPIRY_MARGIN_SECONDS
+
+    def set_events(self, user_id: str, events: list[dict]) -> None:
+        entry = self._entry(user_id)
+        entry["events"] = events
+        entry["events_expires_at"] = time.time() + self.ttl_seconds
+
+    def delete(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+
+class CalendarPrefetcher:
+    """Schedules background calendar prefetches and serves cached events to the tool."""
+
+    def __init__(self, cache: CalendarCache, concurrency: int):
+        self.cache = cache
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # One in-flight prefetch per user, so it can be cancelled on logout
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._get_token = GetToken(
+            settings.AUTH0_DOMAIN,
+            settings.AUTH0_CLIENT_ID,
+            client_secret=settings.AUTH0_CLIENT_SECRET,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return settings.CALENDAR_PREFETCH_ENABLED and settings.AGENT_MODE == "embedded"
+
+    def schedule(self, session: Optional[dict[str, Any]]) -> None:
+        """
+        Starts a background prefetch for the session's user, if enabled.
+
+        Skipped when the user's events are already cached or being fetched, and
+        dropped when the number of pending prefetches reaches twice the concurrency.
+        """
+        if not self.enabled or not session:
+            return
+
+        user_id = (session.get("user") or {}).get("sub")
+        refresh_token = session.get("refresh_token")
+        if not user_id or not refresh_token:
+            return
+        if user_id in self._tasks or self.cache.get_events(user_id) is not None:
+            return
+        if len(self._tasks) >= 2 * self.concurrency:
+            return
+
+        task = asyncio.create_task(self._prefetch(user_id, refresh_token))
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda _: self._forget_task(user_id, task))
+
+    def _forget_task(self, user_id: str, task: asyncio.Task) -> None:
+        if self._tasks.get(user_id) is task:
+            del self._tasks[user_id]
+
+    def evict(self, user_id: str) -> None:
+        """
+        Cancels any in-flight prefetch for the user and drops their cached data,
+        so nothing is written back after they sign out.
+        """
+        task = self._tasks.pop(user_id, None)
+        if task:
+            task.cancel()
+        self.cache.delete(user_id)
+
+    async def _prefetch(self, user_id: str, refresh_token: str) -> None:
+        try:
+            async with self._semaphore:
+                access_token = self.cache.get_access_token(user_id)
+                if access_token is None:
+                    token_response = await asyncio.to_thread(self.exchange_token, refresh_token)
+                    if token_response is None:
+                        return
+                    access_token = token_response["access_token"]
+                    # Cache writes stay on the event loop; worker threads never touch the cache
+                    self.cache.set_access_token(user_id, access_token, token_response["expires_in"])
+                events = await asyncio.to_thread(fetch_upcoming_events, access_token)
+                self.cache.set_events(user_id, events)
+        except Exception as e:
+            logger.warning("Calendar prefetch failed: %s", e)
+            # The token may have been revoked or the account disconnected
+            self.cache.delete(user_id)
+
+    def exchange_token(self, refresh_token: str) -> Optional[dict[str, Any]]:
+        """
+        Exchanges the Auth0 refresh token for a Google access token via Token Vault.
+
+        Blocking, run it in a thread. Returns None if the account isn't connected
+        or is missing the calendar scopes.
+        """
+        try:
+            response = self._get_token.access_token_for_connection(
+                subject_token_type=SUBJECT_TYPE_REFRESH_TOKEN,
+                subject_token=refresh_token,
+                requested_token_type=REQUESTED_TOKEN_TYPE_TOKEN_VAULT_ACCESS_TOKEN,
+                connection=CALENDAR_CONNECTION,
+            )
+        except Auth0Error:
+            # Not connected yet; the tool will ask for authorization when needed
+            return None
+
+        granted_scopes = response.get("scope", "").split()
+        if any(scope not in granted_scopes for scope in CALENDAR_SCOPES):
+            return None
+
+        return response
+
+    def store_access_token(self, user_id: Optional[str], token_response: dict[str, Any]) -> None:
+        """Caches a token obtained outside of a prefetch, so later calls can reuse it."""
+        if self.enabled and user_id:
+            self.cache.set_access_token(user_id, token_response["access_token"], token_response["expires_in"])
+
+    async def get_events(self, user_id: Optional[str]) -> Optional[list[dict]]:
+        """
+        Returns the user's upcoming events from the cache, or None on a miss.
+
+        If only the access token is still cached, the events are re-fetched with it,
+        skipping the Token Vault exchange.
+        """
+        if not self.enabled or not user_id:
+            return None
+
+        events = self.cache.get_events(user_id)
+        if events is not None:
+            return events
+
+        access_token = self.cache.get_access_token(user_id)
+        if access_token is None:
+            return None
+        try:
+            events = await asyncio.to_thread(fetch_upcoming_events, access_token)
+        except Exception as e:
+            logger.warning("Fetching calendar with cached token failed: %s", e)
+            self.cache.delete(user_id)
+            return None
+
+        self.cache.set_events(user_id, events)
+        return events
+
+
+calendar_prefetcher = CalendarPrefetcher(
+    CalendarCache(
+        ttl_seconds=settings.CALENDAR_PREFETCH_TTL_SECONDS,
+        max_entries=settings.CALENDAR_PREFETCH_MAX_ENTRIES,
+    ),
+    concurrency=settings.CALENDAR_PREFETCH_CONCURRENCY,
+)
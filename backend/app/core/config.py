@@ -1,4 +1,4 @@
-from typing import Annotated, Any, Optional
+from typing import Annotated, Any, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import computed_field, AnyUrl, BeforeValidator
 
@@ -27,6 +27,16 @@ class Settings(BaseSettings):
     LANGGRAPH_API_URL: str = "http://localhost:54367"
     LANGGRAPH_EXTERNAL_URL: Optional[str] = None  # For production deployment
     LANGGRAPH_API_KEY: str = ""
+    # "proxy" forwards chat requests to the LangGraph server,
+    # "embedded" runs the assistant0 graph inside the FastAPI process
+    AGENT_MODE: Literal["proxy", "embedded"] = "proxy"
+
+    # Speculative Google Calendar prefetch after login, account connect and new threads.
+    # Only effective in embedded mode, where the agent shares the FastAPI process cache.
+    CALENDAR_PREFETCH_ENABLED: bool = False
+    CALENDAR_PREFETCH_TTL_SECONDS: int = 300
+    CALENDAR_PREFETCH_MAX_ENTRIES: int = 1000
+    CALENDAR_PREFETCH_CONCURRENCY: int = 2
 
     FRONTEND_HOST: str = "http://localhost:9000"
     BACKEND_CORS_ORIGINS: Annotated[list[AnyUrl] | str, BeforeValidator(parse_cors)] = [
@@ -34,5 +34,6 @@ async def health_check():
     return {
         "status": "healthy",
         "service": settings.APP_NAME,
+        "agent_mode": settings.AGENT_MODE,
         "langgraph_url": settings.langgraph_url,
     }
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Benchmark chat latency and throughput of the proxied and embedded agent modes.
+
+Start one backend per mode (e.g. AGENT_MODE=proxy on :8000 with `langgraph dev`
+running, and AGENT_MODE=embedded on :8001), log in through the frontend, and copy
+the session cookie from the browser. Then run:
+
+    python scripts/benchmark_agent_modes.py \\
+        --target proxy=http://localhost:8000 \\
+        --target embedded=http://localhost:8001 \\
+        --cookie "<cookie header value>" \\
+        --runs 20 --concurrency 4
+
+For each target, every run creates a thread and streams one chat turn through
+/api/agent, measuring time-to-first-token (first non-empty message chunk) and
+total run time. Throughput is reported as completed runs and streamed message
+chunks per second of wall-clock time.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass
+class RunResult:
+    ttft: float | None
+    duration: float
+    chunks: int
+    error: str | None = None
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def run_once(client: httpx.AsyncClient, message: str) -> RunResult:
+    start = time.perf_counter()
+    ttft = None
+    chunks = 0
+    event = None
+
+    response = await client.post("/api/agent/threads", json={})
+    response.raise_for_status()
+    thread_id = response.json()["thread_id"]
+
+    body = {
+        "assistant_id": "agent",
+        "input": {"messages": [{"type": "human", "content": message}]},
+        "stream_mode": ["values", "messages-tuple"],
+    }
+    async with client.stream(
+        "POST", f"/api/agent/threads/{thread_id}/runs/stream", json=body
+    ) as stream:
+        stream.raise_for_status()
+        async for line in stream.aiter_lines():
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:") and event == "error":
+                return RunResult(ttft, time.perf_counter() - start, chunks, line[len("data:"):].strip())
+            elif line.startswith("data:") and event == "messages":
+                chunk, _metadata = json.loads(line[len("data:"):])
+                if chunk.get("content"):
+                    chunks += 1
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+
+    return RunResult(ttft, time.perf_counter() - start, chunks)
+
+
+async def benchmark_target(
+    name: str, base_url: str, cookie: str, message: str, runs: int, concurrency: int
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def guarded(client: httpx.AsyncClient) -> RunResult:
+        async with semaphore:
+            try:
+                return await run_once(client, message)
+            except httpx.HTTPError as e:
+                return RunResult(None, 0.0, 0, str(e))
+
+    async with httpx.AsyncClient(
+        base_url=base_url, headers={"Cookie": cookie}, timeout=None
+    ) as client:
+        # Warm up connections, model clients and token caches before measuring
+        await guarded(client)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(guarded(client) for _ in range(runs)))
+        elapsed = time.perf_counter() - started
+
+    ok = [r for r in results if r.error is None]
+    ttfts = [r.ttft for r in ok if r.ttft is not None]
+    durations = [r.duration for r in ok]
+
+    print(f"== {name} ({base_url})")
+    print(f"  runs: {len(ok)}/{runs} ok, concurrency {concurrency}, wall time {elapsed:.2f}s")
+    if ttfts:
+        print(
+            f"  ttft: p50 {statistics.median(ttfts) * 1000:.0f}ms, "
+            f"p95 {_percentile(ttfts, 95) * 1000:.0f}ms, mean {statistics.mean(ttfts) * 1000:.0f}ms"
+        )
+    if durations:
+        print(
+            f"  run time: p50 {statistics.median(durations) * 1000:.0f}ms, "
+            f"p95 {_percentile(durations, 95) * 1000:.0f}ms"
+        )
+    print(
+        f"  throughput: {len(ok) / elapsed:.2f} runs/s, "
+        f"{sum(r.chunks for r in ok) / elapsed:.1f} chunks/s"
+    )
+    for error in {r.error for r in results if r.error}:
+        print(f"  error: {error}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        help="name=base_url of a running backend, e.g. embedded=http://localhost:8001 (repeatable)",
+    )
+    parser.add_argument("--cookie", required=True, help="Cookie header of a logged-in session")
+    parser.add_argument("--message", default="Hello! Introduce yourself in two sentences.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    for target in args.target:
+        name, _, base_url = target.partition("=")
+        await benchmark_target(
+            name, base_url.rstrip("/"), args.cookie, args.message, args.runs, args.concurrency
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())